@@ -6,11 +6,16 @@ Searches multiple sources for relevant new papers
 
 import requests
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 import argparse
 import sys
 
+# arXiv asks API clients for at most one request every 3 seconds
+ARXIV_REQUEST_INTERVAL = 3.0
+
 class PaperSearcher:
     """Search for academic papers from multiple sources"""
     
@@ -18,9 +23,10 @@ class PaperSearcher:
         self.days_back = days_back
         self.cutoff_date = datetime.now() - timedelta(days=days_back)
         self.papers = []
+        self._last_arxiv_request = 0.0
         
-    def search_arxiv(self, query: str, max_results=20) -> List[Dict]:
-        """Search arXiv for recent papers"""
+    def search_arxiv(self, query: str, max_results=20) -> Iterator[Dict]:
+        """Search arXiv for recent papers, yielding each one as it is parsed"""
         print(f"Searching arXiv for: {query}")
         
         base_url = "http://export.arxiv.org/api/query"
@@ -32,22 +38,25 @@ class PaperSearcher:
             'sortOrder': 'descending'
         }
         
+        # Space out the starts of arXiv requests to respect its rate limit
+        wait = self._last_arxiv_request + ARXIV_REQUEST_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_arxiv_request = time.monotonic()
+        
         try:
             response = requests.get(base_url, params=params)
             response.raise_for_status()
-            
-            # Parse XML response (simplified - would need proper XML parsing)
-            papers = self._parse_arxiv_response(response.text)
-            return papers
         except Exception as e:
             print(f"Error searching arXiv: {e}")
-            return []
+            return
+        
+        yield from self._parse_arxiv_response(response.text)
     
-    def _parse_arxiv_response(self, xml_text: str) -> List[Dict]:
+    def _parse_arxiv_response(self, xml_text: str) -> Iterator[Dict]:
         """Parse arXiv API XML response (simplified)"""
         import xml.etree.ElementTree as ET
         
-        papers = []
         try:
             root = ET.fromstring(xml_text)
             ns = {'atom': 'http://www.w3.org/2005/Atom'}
@@ -79,14 +88,12 @@ class PaperSearcher:
                         'pdf_url': pdf_url or '',
                         'source': 'arXiv'
                     }
-                    papers.append(paper)
+                    yield paper
         except Exception as e:
             print(f"Error parsing arXiv response: {e}")
-        
-        return papers
     
-    def search_semantic_scholar(self, query: str, limit=20) -> List[Dict]:
-        """Search Semantic Scholar API"""
+    def search_semantic_scholar(self, query: str, limit=20) -> Iterator[Dict]:
+        """Search Semantic Scholar API, yielding each paper as it is parsed"""
         print(f"Searching Semantic Scholar for: {query}")
         
         base_url = "https://api.semanticscholar.org/graph/v1/paper/search"
@@ -100,8 +107,11 @@ class PaperSearcher:
             response = requests.get(base_url, params=params)
             response.raise_for_status()
             data = response.json()
-            
-            papers = []
+        except Exception as e:
+            print(f"Error searching Semantic Scholar: {e}")
+            return
+        
+        try:
             for item in data.get('data', []):
                 # Filter by date
                 if 'publicationDate' in item:
@@ -119,39 +129,40 @@ class PaperSearcher:
                     'url': item.get('url', ''),
                     'source': 'Semantic Scholar'
                 }
-                papers.append(paper)
-            
-            return papers
+                yield paper
         except Exception as e:
-            print(f"Error searching Semantic Scholar: {e}")
-            return []
+            print(f"Error parsing Semantic Scholar response: {e}")
     
-    def search_all_sources(self, queries: List[str]) -> List[Dict]:
-        """Search all sources with given queries"""
-        all_papers = []
+    def search_all_sources(self, queries: List[str]) -> Iterator[Dict]:
+        """Search all sources with given queries, yielding unique papers as they are parsed"""
+        seen_titles = set()
         
-        for query in queries:
-            # Search arXiv
-            arxiv_papers = self.search_arxiv(query, max_results=10)
-            all_papers.extend(arxiv_papers)
-            
-            # Search Semantic Scholar
-            ss_papers = self.search_semantic_scholar(query, limit=10)
-            all_papers.extend(ss_papers)
-        
-        # Remove duplicates based on title
-        unique_papers = {}
-        for paper in all_papers:
-            title = paper['title'].lower().strip()
-            if title not in unique_papers:
-                unique_papers[title] = paper
+        def unique(papers: Iterable[Dict]) -> Iterator[Dict]:
+            # Remove duplicates based on title
+            for paper in papers:
+                title = paper['title'].lower().strip()
+                if title not in seen_titles:
+                    seen_titles.add(title)
+                    yield paper
         
-        return list(unique_papers.values())
+        with ThreadPoolExecutor(max_workers=len(queries) or 1) as executor:
+            # Semantic Scholar searches run in the background while the arXiv
+            # searches run here one at a time, paced by search_arxiv
+            ss_results = [
+                executor.submit(list, self.search_semantic_scholar(query, limit=10))
+                for query in queries
+            ]
+            
+            # arXiv papers go first so the arXiv copy of a duplicate (which has
+            # the PDF link) is the one kept
+            for query in queries:
+                yield from unique(self.search_arxiv(query, max_results=10))
+            
+            for future in ss_results:
+                yield from unique(future.result())
     
-    def filter_by_quality(self, papers: List[Dict]) -> List[Dict]:
+    def filter_by_quality(self, papers: Iterable[Dict]) -> Iterator[Dict]:
         """Filter papers by quality criteria"""
-        filtered = []
-        
         for paper in papers:
             # Skip if too old
             if paper.get('published'):
@@ -169,27 +180,27 @@ class PaperSearcher:
             if not any(term in title_lower for term in relevant_terms):
                 continue
             
-            filtered.append(paper)
-        
-        return filtered
+            yield paper
     
-    def generate_report(self, papers: List[Dict], output_file='new_papers.md') -> str:
+    def generate_report(self, papers: Iterable[Dict], output_file='new_papers.md') -> str:
         """Generate markdown report"""
-        report = f"# Weekly Paper Review - {datetime.now().date()}\n\n"
-        report += f"**Search Date**: {datetime.now().strftime('%Y-%m-%d')}\n"
-        report += f"**Papers Found**: {len(papers)}\n"
-        report += f"**Time Window**: Last {self.days_back} days\n\n"
-        report += "---\n\n"
-        
-        if not papers:
-            report += "No new papers found matching criteria.\n"
-            return report
-        
         # Sort by publication date (most recent first)
         sorted_papers = sorted(papers, key=lambda x: x.get('published', ''), reverse=True)
         
+        parts = [
+            f"# Weekly Paper Review - {datetime.now().date()}\n\n",
+            f"**Search Date**: {datetime.now().strftime('%Y-%m-%d')}\n",
+            f"**Papers Found**: {len(sorted_papers)}\n",
+            f"**Time Window**: Last {self.days_back} days\n\n",
+            "---\n\n",
+        ]
+        
+        if not sorted_papers:
+            parts.append("No new papers found matching criteria.\n")
+            return ''.join(parts)
+        
         for i, paper in enumerate(sorted_papers, 1):
-            report += f"## {i}. {paper['title']}\n\n"
+            parts.append(f"## {i}. {paper['title']}\n\n")
             
             # Authors
             authors = paper.get('authors', [])
@@ -197,40 +208,42 @@ class PaperSearcher:
                 author_str = ', '.join(authors[:3])
                 if len(authors) > 3:
                     author_str += f" et al. ({len(authors)} authors)"
-                report += f"**Authors**: {author_str}\n\n"
+                parts.append(f"**Authors**: {author_str}\n\n")
             
             # Publication info
             if paper.get('published'):
-                report += f"**Published**: {paper['published'].split('T')[0]}\n\n"
+                parts.append(f"**Published**: {paper['published'].split('T')[0]}\n\n")
             
-            report += f"**Source**: {paper['source']}\n\n"
+            parts.append(f"**Source**: {paper['source']}\n\n")
             
             # Citations (if available)
             if paper.get('citations'):
-                report += f"**Citations**: {paper['citations']}\n\n"
+                parts.append(f"**Citations**: {paper['citations']}\n\n")
             
             # Summary
             summary = paper.get('summary', '')
             if summary:
                 # Clean up summary
                 summary = ' '.join(summary.split())[:400]
-                report += f"**Summary**: {summary}...\n\n"
+                parts.append(f"**Summary**: {summary}...\n\n")
             
             # Link
             url = paper.get('pdf_url') or paper.get('url', '')
             if url:
-                report += f"**Link**: [{url}]({url})\n\n"
+                parts.append(f"**Link**: [{url}]({url})\n\n")
             
             # Quick assessment section
-            report += "**Quick Assessment**:\n"
-            report += "- [ ] Relevant to review scope\n"
-            report += "- [ ] Peer-reviewed/quality venue\n"
-            report += "- [ ] Adds new insights\n"
-            report += "- [ ] Integration priority: [ ] High / [ ] Medium / [ ] Low\n\n"
+            parts.append("**Quick Assessment**:\n")
+            parts.append("- [ ] Relevant to review scope\n")
+            parts.append("- [ ] Peer-reviewed/quality venue\n")
+            parts.append("- [ ] Adds new insights\n")
+            parts.append("- [ ] Integration priority: [ ] High / [ ] Medium / [ ] Low\n\n")
             
-            report += "**Potential Sections**: \n\n"
-            report += "**Notes**: \n\n"
-            report += "---\n\n"
+            parts.append("**Potential Sections**: \n\n")
+            parts.append("**Notes**: \n\n")
+            parts.append("---\n\n")
+        
+        report = ''.join(parts)
         
         # Save report
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -268,16 +281,16 @@ def main():
     searcher = PaperSearcher(days_back=args.days)
     
     # Search all sources
-    papers = searcher.search_all_sources(queries)
+    papers = list(searcher.search_all_sources(queries))
     print(f"\nTotal papers found: {len(papers)}")
     
     # Filter by quality
-    filtered_papers = searcher.filter_by_quality(papers)
+    filtered_papers = list(searcher.filter_by_quality(papers))
     print(f"After filtering: {len(filtered_papers)} papers")
     
     # Generate report
     if filtered_papers:
-        report = searcher.generate_report(filtered_papers, args.output)
+        searcher.generate_report(filtered_papers, args.output)
         print("\n" + "="*60)
         print("SUMMARY")
         print("="*60)
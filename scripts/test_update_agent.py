@@ -5,8 +5,21 @@ Test script for the update agent - runs a quick validation without heavy API cal
 
 import os
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
+def module_installed(module):
+    """Check that a module can be imported, without running its (slow) imports."""
+    if find_spec(module) is not None:
+        return True
+    
+    # Newer openai releases vendor the aiohttp transport instead of depending on it.
+    # Look for it on disk: find_spec on a submodule would import openai itself
+    openai_spec = find_spec('openai')
+    if module != 'httpx_aiohttp' or openai_spec is None or not openai_spec.submodule_search_locations:
+        return False
+    return Path(openai_spec.submodule_search_locations[0], '_vendor', 'httpx_aiohttp').is_dir()
+
 def test_environment():
     """Test that environment is set up correctly."""
     print("🧪 Testing Update Agent Environment\n")
@@ -39,19 +52,21 @@ def test_environment():
     
     # Check dependencies
     print("\n📦 Checking dependencies:")
-    required_modules = [
-        'openai',
-        'requests',
-        'aiohttp',
-    ]
-    
-    for module in required_modules:
-        try:
-            __import__(module)
+    # Module name -> package that provides it
+    required_modules = {
+        'openai': 'openai',
+        'httpx_aiohttp': '"openai[aiohttp]"',  # aiohttp transport used by the agent's OpenAI client
+        'requests': 'requests',
+        'aiohttp': 'aiohttp',
+        'orjson': 'orjson',
+    }
+    
+    for module, package in required_modules.items():
+        if module_installed(module):
             print(f"✅ {module}")
-        except ImportError:
+        else:
             print(f"❌ {module} - NOT INSTALLED")
-            print(f"   Install with: pip install {module}")
+            print(f"   Install with: pip install {package}")
             return False
     
     return True
@@ -5,27 +5,158 @@ Uses OpenAI API to search for and analyze updates to the review content.
 """
 
 import os
-import json
+import re
+import argparse
 import asyncio
+import functools
+import random
+import mmap
+import shelve
+import time
 import aiohttp
+import openai
+import orjson
+import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from openai import OpenAI
-import requests
+from itertools import islice
+from typing import List, Dict, Any, Optional
+from openai import AsyncOpenAI, DefaultAioHttpClient
 from pathlib import Path
 
+# Atom namespace used by the arXiv API feed
+ARXIV_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+
+# Markdown links: [text](url)
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
+
+# Search prompt lines: **Prompt**: "text"
+_PROMPT_RE = re.compile(rb'^[ \t]*\*\*Prompt\*\*:[ \t]*"?(.+?)"?[ \t\r]*$', re.MULTILINE)
+
+# Model used for paper relevance analysis
+ANALYSIS_MODEL = "gpt-4o-mini"
+
+# Paper analyses cached by URL between runs, pruned to the most recently used entries
+ANALYSIS_CACHE_FILE = '.update_agent_cache'
+ANALYSIS_CACHE_SIZE = 1000
+
+# Number of papers analyzed together in a single OpenAI request
+ANALYSIS_BATCH_SIZE = 10
+
+# Character budgets for the document excerpts sent with the content suggestions prompt
+PAPER_EXCERPT_CHARS = 5000
+README_EXCERPT_CHARS = 4000
+
+# Pending OpenAI Batch API job, carried over between --batch runs
+BATCH_STATE_FILE = Path('.update_agent_batch.json')
+
+# Batch API job states that mean the results are not ready yet
+BATCH_PENDING_STATUSES = ('validating', 'in_progress', 'finalizing', 'cancelling')
+
+# Retry policy for transient network and API failures
+MAX_RETRIES = 5
+RETRY_MIN_WAIT = 1.0
+RETRY_MAX_WAIT = 30.0
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+class RetryableHTTPError(Exception):
+    """HTTP response worth retrying: rate limited or a transient server error."""
+    
+    def __init__(self, status: int, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.headers = headers or {}
+
+RETRYABLE_EXCEPTIONS = (
+    RetryableHTTPError,
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait via a Retry-After header, if any."""
+    headers = getattr(exc, 'headers', None)
+    if headers is None:
+        headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+    
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+def with_retries(func):
+    """Retry a coroutine on transient failures with jittered exponential backoff."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                return await func(*args, **kwargs)
+            except RETRYABLE_EXCEPTIONS as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                
+                wait = _retry_after(e)
+                if wait is None:
+                    wait = max(RETRY_MIN_WAIT, random.uniform(0, min(RETRY_MAX_WAIT, 2 ** attempt)))
+                elif wait > RETRY_MAX_WAIT:
+                    # Don't sleep for as long as the server asks (it can be an hour); give up
+                    raise
+                print(f"  ↻ {e.__class__.__name__}: {e} - retrying in {wait:.1f}s")
+                await asyncio.sleep(wait)
+    
+    return wrapper
+
+class RateLimiter:
+    """Async rate limiter that spaces requests to at most max_rate per time_period seconds."""
+    
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.interval = time_period / max_rate
+        self._next_slot = 0.0
+    
+    async def __aenter__(self):
+        # Reserve the next free slot before sleeping, so concurrent callers queue up
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
 class UpdateAgent:
     """Agent to automatically check for updates to the Agentic AI Systems review."""
     
-    def __init__(self):
+    def __init__(self, use_batch_api: bool = False):
         self.api_key = os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         
-        self.client = OpenAI(api_key=self.api_key)
+        # OpenAI client, created on the event loop when run() starts
+        self.client = None
         self.github_token = os.getenv('GITHUB_TOKEN')
         self.repo = os.getenv('GITHUB_REPOSITORY', 'memari-majid/Agentic-AI-Systems')
         
+        # Submit paper analyses through the OpenAI Batch API instead of real-time calls
+        self.use_batch_api = use_batch_api
+        
+        # Shared HTTP session, created on the event loop when run() starts
+        self._session = None
+        
+        # Per-host rate limits; arXiv asks for at most one request every 3 seconds
+        self._arxiv_limiter = RateLimiter(1, 3.0)
+        self._pypi_limiter = RateLimiter(10, 1.0)
+        self._openai_limiter = RateLimiter(50, 1.0)
+        
+        # Cap on OpenAI requests in flight, tunable to the account's rate limit tier
+        self._oai_sem = asyncio.Semaphore(int(os.getenv('OAI_CONCURRENCY', '8')))
+        
+        # Persistent analysis cache, opened for the duration of run()
+        self._cache = None
+        
         # Load search prompts
         self.search_prompts = self.load_search_prompts()
         
@@ -38,6 +169,91 @@ class UpdateAgent:
             'timestamp': datetime.now().isoformat()
         }
     
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session reused by every request made during a run."""
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+    
+    def _load_cached_analysis(self, paper: Dict[str, Any]) -> bool:
+        """Attach a cached analysis to the paper, returning True on a cache hit."""
+        url = paper.get('url')
+        entry = self._cache.get(url) if url else None
+        if not entry or entry['model'] != ANALYSIS_MODEL:
+            return False
+        
+        paper['analysis'] = entry['analysis']
+        
+        # Refresh the timestamp so recently used entries survive pruning
+        entry['ts'] = time.time()
+        self._cache[url] = entry
+        return True
+    
+    def _store_cached_analysis(self, paper: Dict[str, Any]):
+        """Cache the paper's analysis by URL for later runs."""
+        if paper.get('url') and 'analysis' in paper:
+            self._cache[paper['url']] = {
+                'analysis': paper['analysis'],
+                'model': ANALYSIS_MODEL,
+                'ts': time.time()
+            }
+    
+    def _prune_cache(self):
+        """Evict the least recently used analyses beyond ANALYSIS_CACHE_SIZE."""
+        if len(self._cache) <= ANALYSIS_CACHE_SIZE:
+            return
+        
+        by_age = sorted(self._cache.keys(), key=lambda url: self._cache[url]['ts'])
+        for url in by_age[:len(by_age) - ANALYSIS_CACHE_SIZE]:
+            del self._cache[url]
+    
+    @with_retries
+    async def _http_get(self, url: str, limiter: RateLimiter, params: Optional[Dict[str, Any]] = None,
+                        as_json: bool = False) -> Any:
+        """GET a URL under the host's rate limit, returning the body or None on a non-200 status."""
+        async with limiter:
+            async with self._session.get(url, params=params) as response:
+                if response.status in RETRYABLE_STATUSES:
+                    raise RetryableHTTPError(response.status, response.headers)
+                if response.status != 200:
+                    return None
+                return await response.json() if as_json else await response.text()
+    
+    @with_retries
+    async def _http_head_status(self, url: str) -> int:
+        """HEAD a URL (following redirects) and return its final status code."""
+        async with self._session.head(
+            url,
+            allow_redirects=True,
+            timeout=aiohttp.ClientTimeout(total=5)
+        ) as response:
+            if response.status in RETRYABLE_STATUSES:
+                raise RetryableHTTPError(response.status, response.headers)
+            return response.status
+    
+    @with_retries
+    async def _chat_completion(self, **request):
+        """Create an OpenAI chat completion under the OpenAI rate and concurrency limits."""
+        async with self._oai_sem, self._openai_limiter:
+            return await self.client.chat.completions.create(**request)
+    
+    @with_retries
+    async def _openai_call(self, method, *args, **kwargs):
+        """Call an OpenAI client method, such as a Batch API call, with retries and limits."""
+        async with self._oai_sem, self._openai_limiter:
+            return await method(*args, **kwargs)
+    
+    def _create_client(self) -> AsyncOpenAI:
+        """Create the async OpenAI client, using aiohttp rather than httpx as its transport."""
+        # Retries are handled by with_retries, so the client's own retries are disabled
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=DefaultAioHttpClient()
+        )
+    
     def load_search_prompts(self) -> List[str]:
         """Load search prompts from the SEARCH-PROMPTS-FOR-IMPROVEMENT.md file."""
         prompts_file = Path('arxiv-paper/SEARCH-PROMPTS-FOR-IMPROVEMENT.md')
@@ -46,17 +262,15 @@ class UpdateAgent:
             print("⚠️  Search prompts file not found, using default prompts")
             return self.get_default_prompts()
         
-        prompts = []
-        with open(prompts_file, 'r') as f:
-            content = f.read()
-            # Extract prompts (lines starting with **Prompt**:)
-            lines = content.split('\n')
-            for line in lines:
-                if line.strip().startswith('**Prompt**:'):
-                    prompt = line.split('**Prompt**:')[1].strip().strip('"')
-                    prompts.append(prompt)
+        # mmap cannot map an empty file
+        if prompts_file.stat().st_size == 0:
+            return []
         
-        return prompts[:15]  # Limit to first 15 prompts to avoid API costs
+        # Scan the mapped bytes so only the pages up to the 15th match are read
+        with open(prompts_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Extract prompts (lines starting with **Prompt**:)
+            matches = islice(_PROMPT_RE.finditer(mm), 15)  # Limit to first 15 prompts to avoid API costs
+            return [match.group(1).decode('utf-8') for match in matches]
     
     def get_default_prompts(self) -> List[str]:
         """Default search prompts if file is not available."""
@@ -73,14 +287,14 @@ class UpdateAgent:
             "GPT-4V multimodal agents vision-language reasoning 2024"
         ]
     
-    async def search_arxiv(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
-        """Search arXiv for recent papers."""
+    async def search_arxiv(self, queries: List[str], max_results: int = 5) -> List[Dict[str, Any]]:
+        """Search arXiv for recent papers matching any of the queries, in a single request."""
         # Calculate date 6 months ago
         six_months_ago = (datetime.now() - timedelta(days=180)).strftime('%Y%m%d')
         
         url = 'http://export.arxiv.org/api/query'
         params = {
-            'search_query': f'all:{query}',
+            'search_query': ' OR '.join(f'(all:{query})' for query in queries),
             'start': 0,
             'max_results': max_results,
             'sortBy': 'lastUpdatedDate',
@@ -88,11 +302,9 @@ class UpdateAgent:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        text = await response.text()
-                        return self.parse_arxiv_response(text)
+            text = await self._http_get(url, self._arxiv_limiter, params=params)
+            if text:
+                return self.parse_arxiv_response(text)
         except Exception as e:
             print(f"⚠️  Error searching arXiv: {e}")
         
@@ -100,51 +312,52 @@ class UpdateAgent:
     
     def parse_arxiv_response(self, xml_text: str) -> List[Dict[str, Any]]:
         """Parse arXiv API XML response."""
-        # Simple XML parsing (in production, use xml.etree.ElementTree)
         papers = []
-        entries = xml_text.split('<entry>')
         
-        for entry in entries[1:]:  # Skip first split (header)
-            if '</entry>' not in entry:
-                continue
-            
+        try:
+            root = ET.fromstring(xml_text)
+        except ET.ParseError as e:
+            print(f"⚠️  Error parsing arXiv response: {e}")
+            return papers
+        
+        for entry in root.findall('atom:entry', ARXIV_NS):
             paper = {}
             
             # Extract title
-            if '<title>' in entry:
-                title = entry.split('<title>')[1].split('</title>')[0].strip()
+            title = entry.findtext('atom:title', namespaces=ARXIV_NS)
+            if title is not None:
                 paper['title'] = ' '.join(title.split())  # Normalize whitespace
             
             # Extract id/link
-            if '<id>' in entry:
-                paper['url'] = entry.split('<id>')[1].split('</id>')[0].strip()
+            url = entry.findtext('atom:id', namespaces=ARXIV_NS)
+            if url is not None:
+                paper['url'] = url.strip()
             
             # Extract published date
-            if '<published>' in entry:
-                paper['published'] = entry.split('<published>')[1].split('</published>')[0].strip()
+            published = entry.findtext('atom:published', namespaces=ARXIV_NS)
+            if published is not None:
+                paper['published'] = published.strip()
             
             # Extract authors
             authors = []
-            author_entries = entry.split('<author>')
-            for author_entry in author_entries[1:]:
-                if '<name>' in author_entry:
-                    name = author_entry.split('<name>')[1].split('</name>')[0].strip()
-                    authors.append(name)
+            for author in entry.findall('atom:author', ARXIV_NS):
+                name = author.findtext('atom:name', namespaces=ARXIV_NS)
+                if name is not None:
+                    authors.append(name.strip())
             paper['authors'] = authors
             
             # Extract summary
-            if '<summary>' in entry:
-                summary = entry.split('<summary>')[1].split('</summary>')[0].strip()
+            summary = entry.findtext('atom:summary', namespaces=ARXIV_NS)
+            if summary is not None:
                 paper['summary'] = ' '.join(summary.split())[:300]  # First 300 chars
             
             papers.append(paper)
         
         return papers
     
-    async def analyze_paper_relevance(self, paper: Dict[str, Any]) -> Dict[str, Any]:
-        """Use OpenAI to analyze if a paper is relevant to the review."""
-        try:
-            prompt = f"""Analyze if this research paper is relevant to a comprehensive review on Agentic AI Systems.
+    def _relevance_request(self, paper: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the chat completion request that analyzes a single paper."""
+        prompt = f"""Analyze if this research paper is relevant to a comprehensive review on Agentic AI Systems.
             
 Paper Title: {paper.get('title', 'Unknown')}
 Summary: {paper.get('summary', 'No summary available')}
@@ -161,9 +374,62 @@ Respond with JSON:
     "reason": "brief explanation",
     "suggested_section": "which section of the paper this belongs to"
 }}"""
+        
+        return {
+            'model': ANALYSIS_MODEL,  # Using cheaper model for analysis
+            'messages': [
+                {"role": "system", "content": "You are an expert in AI agent systems and academic paper review."},
+                {"role": "user", "content": prompt}
+            ],
+            'response_format': {"type": "json_object"},
+            'temperature': 0.3
+        }
+    
+    async def analyze_paper_relevance(self, paper: Dict[str, Any]) -> Dict[str, Any]:
+        """Use OpenAI to analyze if a paper is relevant to the review."""
+        try:
+            response = await self._chat_completion(**self._relevance_request(paper))
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Using cheaper model for analysis
+            analysis = orjson.loads(response.choices[0].message.content)
+            paper['analysis'] = analysis
+            return paper
+            
+        except Exception as e:
+            print(f"⚠️  Error analyzing paper: {e}")
+            return paper
+    
+    async def analyze_batch(self, papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Use OpenAI to analyze the relevance of several papers in a single request."""
+        paper_list = "\n\n".join(
+            f"Paper {i}:\nTitle: {paper.get('title', 'Unknown')}\nSummary: {paper.get('summary', 'No summary available')}"
+            for i, paper in enumerate(papers, 1)
+        )
+        
+        prompt = f"""Analyze if each of these research papers is relevant to a comprehensive review on Agentic AI Systems.
+
+{paper_list}
+
+Consider:
+1. Is it about AI agents, LLM-based agents, or autonomous systems?
+2. Does it introduce new techniques, frameworks, or insights?
+3. Would it add value to a comprehensive review paper?
+
+Respond with JSON containing one result per paper:
+{{
+    "results": [
+        {{
+            "index": paper number,
+            "relevant": true/false,
+            "relevance_score": 0-10,
+            "reason": "brief explanation",
+            "suggested_section": "which section of the paper this belongs to"
+        }}
+    ]
+}}"""
+        
+        try:
+            response = await self._chat_completion(
+                model=ANALYSIS_MODEL,  # Using cheaper model for analysis
                 messages=[
                     {"role": "system", "content": "You are an expert in AI agent systems and academic paper review."},
                     {"role": "user", "content": prompt}
@@ -171,14 +437,145 @@ Respond with JSON:
                 response_format={"type": "json_object"},
                 temperature=0.3
             )
+        except Exception as e:
+            print(f"⚠️  Error analyzing papers: {e}")
+            return papers
+        
+        analyses = {}
+        try:
+            for result in orjson.loads(response.choices[0].message.content)['results']:
+                analyses[int(result.pop('index'))] = result
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"⚠️  Could not parse batch analysis, analyzing papers individually: {e}")
+        
+        # Papers missing from the batch response fall back to single-paper requests,
+        # run concurrently; _chat_completion bounds how many are in flight
+        missing = []
+        for i, paper in enumerate(papers, 1):
+            if i in analyses:
+                paper['analysis'] = analyses[i]
+            else:
+                missing.append(paper)
+        
+        await asyncio.gather(*[self.analyze_paper_relevance(paper) for paper in missing])
+        return papers
+    
+    async def submit_analysis_batch(self, papers: List[Dict[str, Any]]):
+        """Submit relevance analyses for papers as an OpenAI Batch API job."""
+        lines = [
+            orjson.dumps({
+                'custom_id': str(i),
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self._relevance_request(paper)
+            })
+            for i, paper in enumerate(papers)
+        ]
+        
+        input_file = await self._openai_call(
+            self.client.files.create,
+            file=('relevance_analysis.jsonl', b'\n'.join(lines)),
+            purpose='batch'
+        )
+        batch = await self._openai_call(
+            self.client.batches.create,
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        
+        # Keep the papers with the batch id so a later run can attach the results
+        BATCH_STATE_FILE.write_bytes(
+            orjson.dumps({'batch_id': batch.id, 'papers': papers}, option=orjson.OPT_INDENT_2)
+        )
+        
+        print(f"📤 Submitted {len(papers)} paper analyses as batch {batch.id}")
+    
+    async def collect_analysis_batch(self) -> Optional[List[Dict[str, Any]]]:
+        """Collect the papers of a previously submitted batch, or None if it is still running."""
+        state = orjson.loads(BATCH_STATE_FILE.read_bytes())
+        
+        batch = await self._openai_call(self.client.batches.retrieve, state['batch_id'])
+        if batch.status in BATCH_PENDING_STATUSES:
+            print(f"⏳ Batch {batch.id} is still {batch.status}, results will be collected on a later run")
+            return None
+        
+        if batch.status != 'completed':
+            print(f"⚠️  Batch {batch.id} ended with status {batch.status}")
+        
+        # Expired and cancelled batches can still carry partial output
+        papers = state['papers']
+        if batch.output_file_id:
+            output = (await self._openai_call(self.client.files.content, batch.output_file_id)).text
             
-            analysis = json.loads(response.choices[0].message.content)
-            paper['analysis'] = analysis
-            return paper
-            
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                
+                try:
+                    result = orjson.loads(line)
+                    body = result['response']['body']
+                    analysis = orjson.loads(body['choices'][0]['message']['content'])
+                    papers[int(result['custom_id'])]['analysis'] = analysis
+                except (ValueError, KeyError, TypeError, IndexError) as e:
+                    print(f"⚠️  Error reading batch result: {e}")
+        
+        # Only forget the batch once its output has been downloaded and parsed,
+        # so a failed download is retried on the next run
+        BATCH_STATE_FILE.unlink()
+        
+        analyzed = [paper for paper in papers if 'analysis' in paper]
+        print(f"📥 Collected {len(analyzed)} paper analyses from batch {batch.id}")
+        return analyzed
+    
+    async def collect_previous_batch(self) -> Optional[List[Dict[str, Any]]]:
+        """Collect the previous Batch API job, or None if it is pending or hit a transient error."""
+        if not BATCH_STATE_FILE.exists():
+            return []
+        
+        try:
+            return await self.collect_analysis_batch()
+        except RETRYABLE_EXCEPTIONS as e:
+            # Keep the state file so the job is collected on a later run
+            print(f"⚠️  Error collecting the OpenAI Batch API job: {e}")
+            return None
+        except (openai.APIStatusError, ValueError, KeyError, TypeError) as e:
+            # The job is gone or the state file is corrupt; retrying would never succeed,
+            # so forget the job and let this run's papers be queued
+            print(f"⚠️  Dropping the OpenAI Batch API job that cannot be collected: {e}")
+            BATCH_STATE_FILE.unlink(missing_ok=True)
+            return []
+    
+    async def queue_analysis_batch(self, papers: List[Dict[str, Any]]):
+        """Submit the papers that still need an analysis as a new Batch API job."""
+        if not papers:
+            return
+        
+        try:
+            await self.submit_analysis_batch(papers)
         except Exception as e:
-            print(f"⚠️  Error analyzing paper: {e}")
-            return paper
+            print(f"⚠️  Error using the OpenAI Batch API: {e}")
+    
+    async def _fetch_pypi(self, framework: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Fetch the latest release of a framework from PyPI."""
+        try:
+            url = f"https://pypi.org/pypi/{framework['pypi']}/json"
+            data = await self._http_get(url, self._pypi_limiter, as_json=True)
+            if data:
+                latest_version = data['info']['version']
+                release_date = list(data['releases'][latest_version])[0]['upload_time']
+                
+                return {
+                    'framework': framework['name'],
+                    'version': latest_version,
+                    'release_date': release_date,
+                    'url': data['info']['project_urls'].get('Homepage', '')
+                }
+        
+        except Exception as e:
+            print(f"⚠️  Error checking {framework['name']}: {e}")
+        
+        return None
     
     async def check_framework_updates(self) -> List[Dict[str, Any]]:
         """Check for updates to major frameworks mentioned in the review."""
@@ -191,36 +588,42 @@ Respond with JSON:
             {'name': 'CrewAI', 'pypi': 'crewai', 'github': 'joaomdmoura/crewAI'},
         ]
         
-        updates = []
+        # Check PyPI versions concurrently for frameworks published there
+        results = await asyncio.gather(
+            *[self._fetch_pypi(framework) for framework in frameworks if 'pypi' in framework],
+            return_exceptions=True
+        )
         
-        for framework in frameworks:
+        return [result for result in results if isinstance(result, dict)]
+    
+    async def _check_link(self, filepath: Path, text: str, url: str,
+                          semaphore: asyncio.BoundedSemaphore) -> Optional[Dict[str, Any]]:
+        """Check a single link, returning a broken-link record or None if it resolves."""
+        async with semaphore:
             try:
-                # Check PyPI version if available
-                if 'pypi' in framework:
-                    url = f"https://pypi.org/pypi/{framework['pypi']}/json"
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                latest_version = data['info']['version']
-                                release_date = list(data['releases'][latest_version])[0]['upload_time']
-                                
-                                updates.append({
-                                    'framework': framework['name'],
-                                    'version': latest_version,
-                                    'release_date': release_date,
-                                    'url': data['info']['project_urls'].get('Homepage', '')
-                                })
-                
-                # Add small delay to avoid rate limiting
-                await asyncio.sleep(0.5)
-                
+                status = await self._http_head_status(url)
+            except RetryableHTTPError as e:
+                # Still rate limited or failing after all retries
+                status = e.status
             except Exception as e:
-                print(f"⚠️  Error checking {framework['name']}: {e}")
-        
-        return updates
+                return {
+                    'file': str(filepath),
+                    'text': text,
+                    'url': url,
+                    'error': str(e)
+                }
+        
+        if status >= 400:
+            return {
+                'file': str(filepath),
+                'text': text,
+                'url': url,
+                'status': status
+            }
+        
+        return None
     
-    def verify_links_in_file(self, filepath: Path) -> List[Dict[str, Any]]:
+    async def verify_links_in_file(self, filepath: Path) -> List[Dict[str, Any]]:
         """Verify links in a markdown file."""
         broken_links = []
         
@@ -232,34 +635,16 @@ Respond with JSON:
                 content = f.read()
             
             # Simple markdown link extraction: [text](url)
-            import re
-            links = re.findall(r'\[([^\]]+)\]\(([^\)]+)\)', content)
+            links = _LINK_RE.findall(content)
             
-            for text, url in links[:20]:  # Limit to first 20 links
-                # Skip anchors and relative paths
-                if url.startswith('#') or url.startswith('/') or not url.startswith('http'):
-                    continue
-                
-                try:
-                    response = requests.head(url, timeout=5, allow_redirects=True)
-                    if response.status_code >= 400:
-                        broken_links.append({
-                            'file': str(filepath),
-                            'text': text,
-                            'url': url,
-                            'status': response.status_code
-                        })
-                except Exception as e:
-                    broken_links.append({
-                        'file': str(filepath),
-                        'text': text,
-                        'url': url,
-                        'error': str(e)
-                    })
-                
-                # Rate limiting
-                import time
-                time.sleep(0.3)
+            # Check links concurrently; skip anchors and relative paths
+            semaphore = asyncio.BoundedSemaphore(20)
+            results = await asyncio.gather(*[
+                self._check_link(filepath, text, url, semaphore)
+                for text, url in links[:20]  # Limit to first 20 links
+                if url.startswith('http')
+            ])
+            broken_links = [result for result in results if result]
         
         except Exception as e:
             print(f"⚠️  Error verifying links in {filepath}: {e}")
@@ -275,13 +660,12 @@ Respond with JSON:
             
             context = ""
             if paper_file.exists():
-                with open(paper_file, 'r') as f:
-                    # Read first 5000 characters
-                    context += f"Paper excerpt:\n{f.read(5000)}\n\n"
+                with open(paper_file, 'r', encoding='utf-8', errors='ignore') as f:
+                    context += f"Paper excerpt:\n{f.read(PAPER_EXCERPT_CHARS)}\n\n"
             
             if readme_file.exists():
-                with open(readme_file, 'r') as f:
-                    context += f"README:\n{f.read()}\n\n"
+                with open(readme_file, 'r', encoding='utf-8', errors='ignore') as f:
+                    context += f"README:\n{f.read(README_EXCERPT_CHARS)}\n\n"
             
             prompt = f"""Based on this Agentic AI Systems review content, suggest 5 specific improvements or topics that should be added to keep it up-to-date with the latest developments in 2025.
 
@@ -296,7 +680,7 @@ Focus on:
 
 Provide specific, actionable suggestions."""
             
-            response = self.client.chat.completions.create(
+            response = await self._chat_completion(
                 model="gpt-4o",  # Using advanced model for strategic suggestions
                 messages=[
                     {"role": "system", "content": "You are an expert in AI agent systems and stay current with the latest research and developments."},
@@ -319,75 +703,139 @@ Provide specific, actionable suggestions."""
     
     async def run(self):
         """Run the complete update check process."""
-        print("🤖 Starting Agentic AI Systems Update Agent...")
-        print(f"📅 Timestamp: {datetime.now().isoformat()}")
-        print(f"🔍 Loaded {len(self.search_prompts)} search prompts\n")
-        
-        # 1. Search for new papers
-        print("📚 Searching for new research papers...")
-        relevant_papers = []
-        
-        for i, prompt in enumerate(self.search_prompts[:10], 1):  # Limit to 10 searches
-            print(f"  [{i}/10] Searching: {prompt[:60]}...")
-            papers = await self.search_arxiv(prompt, max_results=3)
-            
-            for paper in papers:
-                analyzed = await self.analyze_paper_relevance(paper)
-                if analyzed.get('analysis', {}).get('relevant', False):
-                    relevant_papers.append(analyzed)
-            
-            # Rate limiting
-            await asyncio.sleep(1)
-        
-        # Remove duplicates by URL
-        seen_urls = set()
-        unique_papers = []
-        for paper in relevant_papers:
-            url = paper.get('url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_papers.append(paper)
-        
-        self.findings['new_papers'] = sorted(
-            unique_papers, 
-            key=lambda x: x.get('analysis', {}).get('relevance_score', 0),
-            reverse=True
-        )[:15]  # Top 15 papers
-        
-        print(f"✅ Found {len(self.findings['new_papers'])} relevant papers\n")
-        
-        # 2. Check framework updates
-        print("🔧 Checking framework updates...")
-        self.findings['framework_updates'] = await self.check_framework_updates()
-        print(f"✅ Checked {len(self.findings['framework_updates'])} frameworks\n")
-        
-        # 3. Verify links (sample)
-        print("🔗 Verifying links...")
-        key_files = [
-            Path('README.md'),
-            Path('arxiv-paper/paper.tex')
-        ]
-        
-        for file in key_files:
-            if file.exists():
-                broken = self.verify_links_in_file(file)
-                self.findings['broken_links'].extend(broken)
-        
-        print(f"✅ Found {len(self.findings['broken_links'])} broken links\n")
-        
-        # 4. Generate content suggestions
-        print("💡 Generating content suggestions...")
-        self.findings['content_suggestions'] = await self.generate_content_suggestions()
-        print(f"✅ Generated {len(self.findings['content_suggestions'])} suggestions\n")
-        
-        # 5. Generate report
-        self.generate_report()
-        
-        print("✨ Update check complete!")
+        self._session = self._create_session()
+        self.client = self._create_client()
+        self._cache = shelve.open(ANALYSIS_CACHE_FILE)
+        try:
+            print("🤖 Starting Agentic AI Systems Update Agent...")
+            print(f"📅 Timestamp: {datetime.now().isoformat()}")
+            print(f"🔍 Loaded {len(self.search_prompts)} search prompts\n")
+            
+            # 1. Search for new papers
+            print("📚 Searching for new research papers...")
+            prompts = self.search_prompts[:10]  # Limit to 10 prompts
+            print(f"  Searching arXiv for {len(prompts)} prompts in one combined query...")
+            
+            # One OR query instead of a request per prompt; arXiv is slow per request
+            # and asks for a 3 second gap between them. The 50 most recently updated
+            # matches are returned across all prompts, so a broad prompt can take most
+            # of them; per-topic coverage is traded for a single round trip
+            papers = await self.search_arxiv(prompts, max_results=50) if prompts else []
+            
+            # Remove duplicates by URL before analysis, so each paper is only analyzed once
+            unique_papers = {paper['url']: paper for paper in papers if paper.get('url')}
+            all_papers = list(unique_papers.values())
+            
+            # In batch mode, collect and cache the previous job first, so papers it
+            # already analyzed count as cached below instead of being submitted again
+            collected_papers = []
+            if self.use_batch_api:
+                collected_papers = await self.collect_previous_batch()
+                for paper in collected_papers or []:
+                    self._store_cached_analysis(paper)
+            
+            # Reuse analyses cached by earlier runs; only unseen papers go to OpenAI
+            cached_papers = []
+            new_papers = []
+            for paper in all_papers:
+                if self._load_cached_analysis(paper):
+                    cached_papers.append(paper)
+                else:
+                    new_papers.append(paper)
+            
+            if self.use_batch_api:
+                # Results arrive on a later run, when the Batch API job has finished.
+                # Don't queue another job while the previous one is still pending
+                if collected_papers is not None:
+                    await self.queue_analysis_batch(new_papers)
+                
+                # Collected papers found again by this search are already in cached_papers
+                analyzed_papers = [
+                    paper for paper in collected_papers or []
+                    if paper.get('url') not in unique_papers
+                ]
+            else:
+                # Analyze papers in batches, running the batches concurrently;
+                # _chat_completion bounds the requests in flight
+                batches = [
+                    new_papers[i:i + ANALYSIS_BATCH_SIZE]
+                    for i in range(0, len(new_papers), ANALYSIS_BATCH_SIZE)
+                ]
+                analyzed_batches = await asyncio.gather(*[self.analyze_batch(batch) for batch in batches])
+                analyzed_papers = [paper for batch in analyzed_batches for paper in batch]
+            
+            for paper in analyzed_papers:
+                self._store_cached_analysis(paper)
+            
+            print(f"  Reused {len(cached_papers)} cached analyses, analyzed {len(analyzed_papers)} papers")
+            
+            relevant_papers = [
+                paper for paper in cached_papers + analyzed_papers
+                if paper.get('analysis', {}).get('relevant', False)
+            ]
+            
+            self.findings['new_papers'] = sorted(
+                relevant_papers,
+                key=lambda x: x.get('analysis', {}).get('relevance_score', 0),
+                reverse=True
+            )[:15]  # Top 15 papers
+            
+            print(f"✅ Found {len(self.findings['new_papers'])} relevant papers\n")
+            
+            # 2. Check framework updates
+            print("🔧 Checking framework updates...")
+            self.findings['framework_updates'] = await self.check_framework_updates()
+            print(f"✅ Checked {len(self.findings['framework_updates'])} frameworks\n")
+            
+            # 3. Verify links (sample)
+            print("🔗 Verifying links...")
+            key_files = [
+                Path('README.md'),
+                Path('arxiv-paper/paper.tex')
+            ]
+            
+            for file in key_files:
+                if file.exists():
+                    broken = await self.verify_links_in_file(file)
+                    self.findings['broken_links'].extend(broken)
+            
+            print(f"✅ Found {len(self.findings['broken_links'])} broken links\n")
+            
+            # 4. Generate content suggestions
+            print("💡 Generating content suggestions...")
+            self.findings['content_suggestions'] = await self.generate_content_suggestions()
+            print(f"✅ Generated {len(self.findings['content_suggestions'])} suggestions\n")
+            
+            # 5. Generate report
+            self.generate_report()
+            
+            print("✨ Update check complete!")
+        finally:
+            self._prune_cache()
+            self._cache.close()
+            await self.client.close()
+            await self._session.close()
+    
+    def _write_findings_json(self, f):
+        """Write the findings as indented JSON, serializing one list item at a time."""
+        f.write(b'{')
+        for i, (key, value) in enumerate(self.findings.items()):
+            f.write(b',\n  ' if i else b'\n  ')
+            f.write(orjson.dumps(key) + b': ')
+            if isinstance(value, list) and value:
+                for j, item in enumerate(value):
+                    f.write(b',\n    ' if j else b'[\n    ')
+                    f.write(orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n    '))
+                f.write(b'\n  ]')
+            else:
+                f.write(orjson.dumps(value, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+        f.write(b'\n}' if self.findings else b'}')
     
     def generate_report(self):
         """Generate a markdown report of findings."""
-        report = f"""# Agentic AI Systems - Automated Update Report
+        # Sections are written straight to the file rather than built up as one string
+        with open('update_report.md', 'w', encoding='utf-8') as f:
+            f.write(f"""# Agentic AI Systems - Automated Update Report
 
 **Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
 
@@ -402,12 +850,12 @@ Provide specific, actionable suggestions."""
 
 ## 📚 New Relevant Papers
 
-"""
-        
-        if self.findings['new_papers']:
-            for i, paper in enumerate(self.findings['new_papers'][:10], 1):
-                analysis = paper.get('analysis', {})
-                report += f"""### {i}. {paper.get('title', 'Unknown Title')}
+""")
+            
+            if self.findings['new_papers']:
+                for i, paper in enumerate(self.findings['new_papers'][:10], 1):
+                    analysis = paper.get('analysis', {})
+                    f.write(f"""### {i}. {paper.get('title', 'Unknown Title')}
 
 - **Authors**: {', '.join(paper.get('authors', [])[:3])}
 - **Published**: {paper.get('published', 'Unknown')[:10]}
@@ -416,62 +864,58 @@ Provide specific, actionable suggestions."""
 - **Suggested Section**: {analysis.get('suggested_section', 'N/A')}
 - **URL**: {paper.get('url', 'N/A')}
 
-"""
-        else:
-            report += "*No new highly relevant papers found in this update cycle.*\n\n"
-        
-        report += "---\n\n## 🔧 Framework Updates\n\n"
-        
-        if self.findings['framework_updates']:
-            for update in self.findings['framework_updates']:
-                report += f"- **{update['framework']}**: v{update['version']} (released {update['release_date'][:10]})\n"
-        else:
-            report += "*No framework updates detected.*\n"
-        
-        report += "\n---\n\n## 🔗 Broken Links\n\n"
-        
-        if self.findings['broken_links']:
-            for link in self.findings['broken_links'][:10]:
-                status = link.get('status', link.get('error', 'Unknown'))
-                report += f"- **File**: `{link['file']}`\n  - Text: {link['text']}\n  - URL: {link['url']}\n  - Status: {status}\n\n"
-        else:
-            report += "*No broken links detected.*\n"
-        
-        report += "\n---\n\n## 💡 Content Improvement Suggestions\n\n"
-        
-        if self.findings['content_suggestions']:
-            for i, suggestion in enumerate(self.findings['content_suggestions'], 1):
-                report += f"{i}. {suggestion}\n"
-        else:
-            report += "*No specific suggestions generated.*\n"
-        
-        report += f"\n---\n\n## 🎯 Action Items\n\n"
-        
-        if self.findings['new_papers']:
-            report += f"1. **Review Top Papers**: Evaluate the {min(5, len(self.findings['new_papers']))} highest-scoring papers for inclusion\n"
-        
-        if self.findings['framework_updates']:
-            report += f"2. **Update Framework Versions**: Review and update framework version references\n"
-        
-        if self.findings['broken_links']:
-            report += f"3. **Fix Broken Links**: Update or remove {len(self.findings['broken_links'])} broken links\n"
-        
-        if self.findings['content_suggestions']:
-            report += f"4. **Consider Suggestions**: Review and implement relevant content improvements\n"
-        
-        if not any([self.findings['new_papers'], self.findings['framework_updates'], 
-                   self.findings['broken_links'], self.findings['content_suggestions']]):
-            report += "*No significant updates found. The review appears to be current.*\n"
-        
-        report += "\n---\n\n*This report was automatically generated by the Agentic AI Systems Update Agent.*\n"
-        
-        # Save report
-        with open('update_report.md', 'w') as f:
-            f.write(report)
+""")
+            else:
+                f.write("*No new highly relevant papers found in this update cycle.*\n\n")
+            
+            f.write("---\n\n## 🔧 Framework Updates\n\n")
+            
+            if self.findings['framework_updates']:
+                for update in self.findings['framework_updates']:
+                    f.write(f"- **{update['framework']}**: v{update['version']} (released {update['release_date'][:10]})\n")
+            else:
+                f.write("*No framework updates detected.*\n")
+            
+            f.write("\n---\n\n## 🔗 Broken Links\n\n")
+            
+            if self.findings['broken_links']:
+                for link in self.findings['broken_links'][:10]:
+                    status = link.get('status', link.get('error', 'Unknown'))
+                    f.write(f"- **File**: `{link['file']}`\n  - Text: {link['text']}\n  - URL: {link['url']}\n  - Status: {status}\n\n")
+            else:
+                f.write("*No broken links detected.*\n")
+            
+            f.write("\n---\n\n## 💡 Content Improvement Suggestions\n\n")
+            
+            if self.findings['content_suggestions']:
+                for i, suggestion in enumerate(self.findings['content_suggestions'], 1):
+                    f.write(f"{i}. {suggestion}\n")
+            else:
+                f.write("*No specific suggestions generated.*\n")
+            
+            f.write(f"\n---\n\n## 🎯 Action Items\n\n")
+            
+            if self.findings['new_papers']:
+                f.write(f"1. **Review Top Papers**: Evaluate the {min(5, len(self.findings['new_papers']))} highest-scoring papers for inclusion\n")
+            
+            if self.findings['framework_updates']:
+                f.write(f"2. **Update Framework Versions**: Review and update framework version references\n")
+            
+            if self.findings['broken_links']:
+                f.write(f"3. **Fix Broken Links**: Update or remove {len(self.findings['broken_links'])} broken links\n")
+            
+            if self.findings['content_suggestions']:
+                f.write(f"4. **Consider Suggestions**: Review and implement relevant content improvements\n")
+            
+            if not any([self.findings['new_papers'], self.findings['framework_updates'], 
+                       self.findings['broken_links'], self.findings['content_suggestions']]):
+                f.write("*No significant updates found. The review appears to be current.*\n")
+            
+            f.write("\n---\n\n*This report was automatically generated by the Agentic AI Systems Update Agent.*\n")
         
         # Save JSON findings
-        with open('update_suggestions.json', 'w') as f:
-            json.dump(self.findings, f, indent=2)
+        with open('update_suggestions.json', 'wb') as f:
+            self._write_findings_json(f)
         
         print(f"📝 Report saved to update_report.md")
         print(f"💾 Findings saved to update_suggestions.json")
@@ -479,8 +923,14 @@ Provide specific, actionable suggestions."""
 
 async def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='Check for updates to the Agentic AI Systems review')
+    parser.add_argument('--batch', action='store_true',
+                        help='Submit paper analyses through the OpenAI Batch API (50%% cheaper, '
+                             'results are collected on the next run)')
+    args = parser.parse_args()
+    
     try:
-        agent = UpdateAgent()
+        agent = UpdateAgent(use_batch_api=args.batch)
         await agent.run()
     except Exception as e:
         print(f"❌ Error running update agent: {e}")
@@ -8,6 +8,25 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+# LaTeX commands rewritten by update_latex_version, matched in a single pass
+_LATEX_RE = re.compile(
+    r'(?P<date>\\date\{[^}]+\})'
+    r'|(?P<paperversion>\\newcommand\{\\paperversion\}\{[^}]+\})'
+    r'|(?P<lastupdated>\\newcommand\{\\lastupdated\}\{[^}]+\})'
+    r'|(?P<documentclass>\\documentclass\[12pt\]\{article\})'
+)
+
+# Markdown frontmatter patterns
+_VERSION_BLOCK_RE = re.compile(r'^---\nversion:.*?\n---\n\n', re.MULTILINE | re.DOTALL)
+_FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n\n', re.DOTALL)
+_VERSION_LINE_RE = re.compile(r'version:.*')
+_LAST_UPDATED_LINE_RE = re.compile(r'last_updated:.*')
+_LAST_UPDATED_DISPLAY_LINE_RE = re.compile(r'last_updated_display:.*')
+
+# Markdown body patterns
+_LAST_UPDATED_BOLD_RE = re.compile(r'\*\*Last Updated\*\*:.*')
+_INFO_BOX_RE = re.compile(r'(!!! info "Paper Information"[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n)')
+
 def get_version_info():
     """Get current version and date"""
     now = datetime.now()
@@ -32,26 +51,32 @@ def update_latex_version(paper_tex_path, version_info):
     with open(paper_tex_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Update date in LaTeX - use lambda to avoid escape issues
-    def replace_date(match):
-        return f"\\date{{{version_info['date']}}}"
-    
-    content = re.sub(r'\\date\{[^}]+\}', replace_date, content)
-    
-    # Add version command if not exists
-    if '\\newcommand{\\paperversion}' not in content:
-        # Add after documentclass
-        def add_version(match):
-            return f"{match.group(1)}\n\\newcommand{{\\paperversion}}{{{version_info['version']}}}\n\\newcommand{{\\lastupdated}}{{{version_info['date']}}}"
-        content = re.sub(r'(\\documentclass\[12pt\]\{article\})', add_version, content)
-    else:
-        # Update existing version command
-        def update_version(match):
-            return f"\\newcommand{{\\paperversion}}{{{version_info['version']}}}"
-        def update_date(match):
-            return f"\\newcommand{{\\lastupdated}}{{{version_info['date']}}}"
-        content = re.sub(r'\\newcommand\{\\paperversion\}\{[^}]+\}', update_version, content)
-        content = re.sub(r'\\newcommand\{\\lastupdated\}\{[^}]+\}', update_date, content)
+    # Nothing to do if today's date and version are already in place
+    want_date = f"\\date{{{version_info['date']}}}"
+    want_version = f"\\newcommand{{\\paperversion}}{{{version_info['version']}}}"
+    want_lastupdated = f"\\newcommand{{\\lastupdated}}{{{version_info['date']}}}"
+    if want_date in content and want_version in content and want_lastupdated in content:
+        print(f"✅ LaTeX version already {version_info['version']}")
+        return True
+    
+    # Update the date and version commands in one pass, or add the version
+    # commands after documentclass if they don't exist yet. A function is used
+    # as the replacement to avoid escape issues
+    has_version = '\\newcommand{\\paperversion}' in content
+    
+    def replace(match):
+        kind = match.lastgroup
+        if kind == 'date':
+            return want_date
+        if kind == 'documentclass':
+            if has_version:
+                return match.group(0)
+            return f"{match.group(0)}\n{want_version}\n{want_lastupdated}"
+        if not has_version:
+            return match.group(0)
+        return want_version if kind == 'paperversion' else want_lastupdated
+    
+    content = _LATEX_RE.sub(replace, content)
     
     with open(paper_tex_path, 'w', encoding='utf-8') as f:
         f.write(content)
@@ -63,7 +88,7 @@ def update_html_version(paper_dir, version_info):
     """Update version in HTML paper pages"""
     paper_dir = Path(paper_dir)
     
-    if not paper_dir.exists():
+    if not paper_dir.is_dir():
         print(f"Paper directory not found: {paper_dir}")
         return False
     
@@ -82,13 +107,16 @@ def update_html_version(paper_dir, version_info):
     
     updated_count = 0
     
+    # One directory listing instead of an exists() stat per file
+    present = set(os.listdir(paper_dir))
+    
     for filename in files_to_update:
-        filepath = paper_dir / filename
-        if not filepath.exists():
+        if filename not in present:
             continue
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        filepath = paper_dir / filename
+        content = filepath.read_text(encoding='utf-8')
+        original_content = content
         
         # Add or update version info at the top
         version_block = f"""---
@@ -100,37 +128,35 @@ last_updated_display: {version_info['date']}
 """
         
         # Remove existing version block if present
-        content = re.sub(r'^---\nversion:.*?\n---\n\n', '', content, flags=re.MULTILINE | re.DOTALL)
+        content = _VERSION_BLOCK_RE.sub('', content)
         
         # Add new version block at the beginning
         if not content.startswith('---'):
             content = version_block + content
         else:
             # If there's already frontmatter, update it
-            frontmatter_pattern = r'^---\n(.*?)\n---\n\n'
-            match = re.match(frontmatter_pattern, content, re.DOTALL)
+            match = _FRONTMATTER_RE.match(content)
             if match:
                 # Update existing frontmatter
                 existing = match.group(1)
                 if 'version:' not in existing:
                     existing += f"\nversion: {version_info['version']}"
                 else:
-                    existing = re.sub(r'version:.*', f"version: {version_info['version']}", existing)
+                    existing = _VERSION_LINE_RE.sub(f"version: {version_info['version']}", existing)
                 
                 if 'last_updated:' not in existing:
                     existing += f"\nlast_updated: {version_info['date_iso']}"
                     existing += f"\nlast_updated_display: {version_info['date']}"
                 else:
-                    existing = re.sub(r'last_updated:.*', f"last_updated: {version_info['date_iso']}", existing)
-                    existing = re.sub(r'last_updated_display:.*', f"last_updated_display: {version_info['date']}", existing)
+                    existing = _LAST_UPDATED_LINE_RE.sub(f"last_updated: {version_info['date_iso']}", existing)
+                    existing = _LAST_UPDATED_DISPLAY_LINE_RE.sub(f"last_updated_display: {version_info['date']}", existing)
                 
                 content = f"---\n{existing}\n---\n\n" + content[match.end():]
             else:
                 content = version_block + content
         
         # Also update any "Last Updated" text in the content
-        content = re.sub(
-            r'\*\*Last Updated\*\*:.*',
+        content = _LAST_UPDATED_BOLD_RE.sub(
             f"**Last Updated**: {version_info['date']}",
             content
         )
@@ -140,15 +166,16 @@ last_updated_display: {version_info['date']}
             # Find a good place to insert version info
             if '!!! info' in content:
                 # Add after first info box
-                content = re.sub(
-                    r'(!!! info "Paper Information"[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n)',
+                content = _INFO_BOX_RE.sub(
                     r'\1\n!!! success "Version Information"\n    **Version**: ' + version_info['version'] + '\n    **Last Updated**: ' + version_info['date'] + '\n    **Status**: Automatically updated weekly\n\n',
                     content
                 )
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Skip the write when re-running on the same day leaves the page unchanged
+        if content == original_content:
+            continue
         
+        filepath.write_text(content, encoding='utf-8')
         updated_count += 1
     
     print(f"✅ Updated {updated_count} HTML paper pages")